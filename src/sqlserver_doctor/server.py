@@ -1,8 +1,14 @@
 """SQL Server Doctor MCP Server - Main server implementation."""
 
+import functools
+import weakref
+from datetime import datetime
+from collections.abc import Callable
 from typing import Any
+
+import anyio.to_thread
 from mcp.server.fastmcp import FastMCP
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from sqlserver_doctor.utils.connection import get_connection
 from sqlserver_doctor.utils.logger import setup_logger
@@ -15,6 +21,23 @@ mcp = FastMCP("SQL Server Doctor")
 logger.info("SQL Server Doctor MCP Server initialized")
 
 
+def _run_in_thread(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap a synchronous tool function in an async worker-thread wrapper.
+
+    pyodbc calls block, and FastMCP runs synchronous tools directly on the
+    event loop, so one slow DMV query would stall every other request on
+    the stdio server. The wrapper keeps the underlying function callable
+    synchronously (used by the tests) while tool invocations run off-loop.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return await anyio.to_thread.run_sync(functools.partial(fn, *args, **kwargs))
+
+    return wrapper
+
+
 # Response models
 class ServerVersionResponse(BaseModel):
     """Response model for server version information."""
@@ -28,9 +51,13 @@ class ServerVersionResponse(BaseModel):
 class DatabaseInfo(BaseModel):
     """Information about a single database."""
 
+    # Row models are built in bulk from trusted DMV rows; freeze them and
+    # ignore unexpected columns instead of storing them
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     name: str = Field(description="Database name")
     database_id: int = Field(description="Database ID")
-    create_date: str = Field(description="Database creation date")
+    create_date: datetime = Field(description="Database creation date")
     state_desc: str = Field(description="Database state (e.g., ONLINE, OFFLINE)")
     recovery_model_desc: str = Field(description="Recovery model (SIMPLE, FULL, BULK_LOGGED)")
     compatibility_level: int = Field(description="Database compatibility level")
@@ -48,6 +75,10 @@ class DatabaseListResponse(BaseModel):
 class ActiveSessionInfo(BaseModel):
     """Information about an active SQL Server session."""
 
+    # Row models are built in bulk from trusted DMV rows; freeze them and
+    # ignore unexpected columns instead of storing them
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     sql_text: str = Field(description="SQL query text being executed")
     session_id: int = Field(description="Session ID")
     status: str = Field(description="Request status (running, suspended, etc.)")
@@ -59,7 +90,7 @@ class ActiveSessionInfo(BaseModel):
     wait_time: int = Field(description="Current wait time in milliseconds")
     last_wait_type: str | None = Field(None, description="Last wait type encountered")
     blocking_session_id: int | None = Field(None, description="Session ID causing blocking, if any")
-    connect_time: str | None = Field(None, description="Connection start time")
+    connect_time: datetime | None = Field(None, description="Connection start time")
     dop: int = Field(description="Degree of parallelism")
     host_name: str | None = Field(None, description="Client host name")
     program_name: str | None = Field(None, description="Client program name")
@@ -79,6 +110,10 @@ class ActiveSessionsResponse(BaseModel):
 class SchedulerStats(BaseModel):
     """Statistics for a single SQL Server scheduler."""
 
+    # Row models are built in bulk from trusted DMV rows; freeze them and
+    # ignore unexpected columns instead of storing them
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     scheduler_id: int = Field(description="Scheduler ID")
     current_tasks_count: int = Field(description="Total tasks assigned to this scheduler")
     runnable_tasks_count: int = Field(
@@ -96,9 +131,7 @@ class SchedulerStatsResponse(BaseModel):
     total_runnable_tasks: int = Field(
         description="Total tasks waiting for CPU across all schedulers"
     )
-    avg_runnable_per_scheduler: float = Field(
-        description="Average runnable tasks per scheduler"
-    )
+    avg_runnable_per_scheduler: float = Field(description="Average runnable tasks per scheduler")
     cpu_pressure_detected: bool = Field(
         description="Whether CPU pressure is detected (runnable tasks > 0)"
     )
@@ -107,8 +140,237 @@ class SchedulerStatsResponse(BaseModel):
     error: str | None = Field(None, description="Error message if query failed")
 
 
+class HealthSnapshotResponse(BaseModel):
+    """Response model for the composite health snapshot."""
+
+    server_version: ServerVersionResponse = Field(description="Server version information")
+    databases: DatabaseListResponse = Field(description="List of databases")
+    active_sessions: ActiveSessionsResponse = Field(description="Currently active sessions")
+    scheduler_stats: SchedulerStatsResponse = Field(description="Scheduler statistics")
+    success: bool = Field(description="Whether all queries were successful")
+
+
+# SQL statements are module-level constants so every invocation sends
+# byte-identical text with no per-call string assembly. The OPTION
+# (RECOMPILE) hints trade plan caching away deliberately: these DMV
+# queries are cheap to compile and must not bloat the monitored server's
+# plan cache or reuse a stale plan.
+_SERVER_VERSION_SQL = """
+    SELECT
+        @@VERSION AS Version,
+        @@SERVERNAME AS ServerName
+    OPTION (RECOMPILE, MAXDOP 1)
+    """
+
+_LIST_DATABASES_SQL = """
+    SELECT
+        name,
+        database_id,
+        create_date,
+        state_desc,
+        recovery_model_desc,
+        compatibility_level
+    FROM sys.databases
+    ORDER BY name
+    OPTION (RECOMPILE, MAXDOP 1)
+    """
+
+# Default cap for the sql_text column, shared by get_active_sessions and
+# the health snapshot batch so the two cannot drift apart
+_MAX_SQL_LEN_DEFAULT = 4000
+
+# max_sql_len is bound as a ? parameter so the statement text stays
+# byte-identical across calls and the value never becomes part of the SQL
+# string. Extracting just the currently executing statement and capping
+# its length server-side avoids shipping multi-megabyte batch texts over
+# the wire.
+_ACTIVE_SESSIONS_SQL = """
+    WITH filtered AS (
+        SELECT *
+        FROM sys.dm_exec_requests
+        WHERE session_id <> @@SPID
+        AND sql_handle IS NOT NULL
+        AND sql_handle <> 0x
+        AND DB_NAME(database_id) NOT IN ('master', 'msdb')
+    )
+    SELECT
+        ISNULL(LEFT(
+            SUBSTRING(
+                sqltext.TEXT,
+                (req.statement_start_offset/2) + 1,
+                ((CASE req.statement_end_offset
+                    WHEN -1 THEN DATALENGTH(sqltext.TEXT)
+                    ELSE req.statement_end_offset
+                  END - req.statement_start_offset)/2) + 1
+            ),
+            ?
+        ), '') as sql_text,
+        req.session_id,
+        req.status,
+        req.command,
+        CONVERT(NUMERIC(8,1), req.cpu_time/1000.0) as cpu_seconds,
+        CONVERT(NUMERIC(8,1), req.total_elapsed_time/1000.0) as elapsed_seconds,
+        req.reads,
+        req.logical_reads,
+        req.wait_time,
+        req.last_wait_type,
+        req.blocking_session_id,
+        con.connect_time,
+        req.dop,
+        dm_es.host_name,
+        dm_es.program_name,
+        DB_NAME(req.database_id) as database_name,
+        dm_es.login_name
+    FROM filtered req
+    LEFT OUTER JOIN sys.dm_exec_sessions dm_es ON dm_es.session_id = req.session_id
+    LEFT OUTER JOIN sys.dm_exec_connections con ON con.connection_id = req.connection_id
+    OUTER APPLY sys.dm_exec_sql_text(req.sql_handle) AS sqltext
+    OPTION (RECOMPILE, MAXDOP 1)
+    """
+
+_SCHEDULER_STATS_SQL = """
+    SELECT
+        COUNT(*) AS scheduler_count,
+        SUM(runnable_tasks_count) AS total_runnable_tasks,
+        MAX(runnable_tasks_count) AS max_runnable,
+        AVG(1.0*runnable_tasks_count) AS avg_runnable_tasks,
+        AVG(1.0*pending_disk_io_count) AS avg_pending_disk_io_count
+    FROM sys.dm_os_schedulers
+    WHERE scheduler_id < 255
+    OPTION (RECOMPILE, MAXDOP 1)
+    """
+
+
+# @@VERSION and @@SERVERNAME never change for the life of a connection, so
+# cache the response per connection instance. Weak keys let the entry die
+# with the connection object if it is ever replaced.
+_server_version_cache: "weakref.WeakKeyDictionary[Any, ServerVersionResponse]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+# Response builders shared by the individual tools and the batched health
+# snapshot, so each response shape is assembled in exactly one place.
+def _build_version_response(results: list[dict[str, Any]]) -> ServerVersionResponse:
+    """Build a ServerVersionResponse from version query rows."""
+    if not results:
+        logger.warning("No results returned from server version query")
+        return ServerVersionResponse(
+            version="",
+            server_name="",
+            success=False,
+            error="No results returned from query",
+        )
+
+    logger.info("Retrieved server version: %s", results[0]["ServerName"])
+    return ServerVersionResponse.model_construct(
+        version=results[0]["Version"],
+        server_name=results[0]["ServerName"],
+        success=True,
+    )
+
+
+def _build_databases_response(results: list[dict[str, Any]]) -> DatabaseListResponse:
+    """Build a DatabaseListResponse from sys.databases rows."""
+    # Rows come from typed sys.databases columns we control, so skip
+    # per-field validation on the hot path
+    databases = [DatabaseInfo.model_construct(**db) for db in results]
+    logger.info("Successfully retrieved %d database(s)", len(databases))
+
+    return DatabaseListResponse.model_construct(
+        databases=databases,
+        count=len(databases),
+        success=True,
+    )
+
+
+def _build_sessions_response(results: list[dict[str, Any]]) -> ActiveSessionsResponse:
+    """Build an ActiveSessionsResponse from active-session rows."""
+    # Rows come from typed DMV columns we control, so skip per-field
+    # validation on the hot path
+    sessions = [ActiveSessionInfo.model_construct(**session) for session in results]
+    logger.info("Successfully retrieved %d active session(s)", len(sessions))
+
+    return ActiveSessionsResponse.model_construct(
+        sessions=sessions,
+        count=len(sessions),
+        success=True,
+    )
+
+
+def _build_scheduler_response(results: list[dict[str, Any]]) -> SchedulerStatsResponse:
+    """Build a SchedulerStatsResponse from the aggregated scheduler row."""
+    # Extract aggregated metrics from single result row
+    if not results:
+        raise Exception("No scheduler statistics returned")
+
+    result = results[0]
+    scheduler_count = result["scheduler_count"]
+    total_runnable = int(result["total_runnable_tasks"])
+    max_runnable = int(result["max_runnable"])
+    avg_runnable = float(result["avg_runnable_tasks"])
+    avg_pending_io = float(result["avg_pending_disk_io_count"])
+
+    # A single scheduler with a waiting task is already pressure, even if
+    # the fleet-wide average rounds toward zero
+    cpu_pressure = max_runnable >= 1
+
+    # Build interpretation based on updated metrics
+    interpretation_parts = []
+
+    # CPU pressure interpretation
+    if avg_runnable == 0:
+        interpretation_parts.append("No CPU pressure detected (avg runnable: 0)")
+    elif avg_runnable <= 0.5:
+        interpretation_parts.append(f"Minimal CPU pressure (avg runnable: {avg_runnable:.2f})")
+    elif avg_runnable <= 2:
+        interpretation_parts.append(f"MILD CPU PRESSURE (avg runnable: {avg_runnable:.2f})")
+    elif avg_runnable <= 5:
+        interpretation_parts.append(
+            f"MODERATE CPU PRESSURE (avg runnable: {avg_runnable:.2f}) - Consider query optimization"
+        )
+    else:
+        interpretation_parts.append(
+            f"CRITICAL CPU PRESSURE (avg runnable: {avg_runnable:.2f}) - Immediate action needed!"
+        )
+
+    # I/O pressure interpretation
+    if avg_pending_io <= 1:
+        interpretation_parts.append(f"Normal I/O activity (avg pending I/O: {avg_pending_io:.2f})")
+    elif avg_pending_io <= 5:
+        interpretation_parts.append(
+            f"MODERATE I/O PRESSURE (avg pending I/O: {avg_pending_io:.2f})"
+        )
+    elif avg_pending_io <= 10:
+        interpretation_parts.append(
+            f"HIGH I/O PRESSURE (avg pending I/O: {avg_pending_io:.2f}) - Check disk performance"
+        )
+    else:
+        interpretation_parts.append(
+            f"CRITICAL I/O BOTTLENECK (avg pending I/O: {avg_pending_io:.2f}) - Check disk subsystem immediately!"
+        )
+
+    interpretation = " | ".join(interpretation_parts)
+
+    logger.info(
+        "Retrieved scheduler stats: %d schedulers, avg runnable: %.2f, avg pending I/O: %.2f",
+        scheduler_count,
+        avg_runnable,
+        avg_pending_io,
+    )
+
+    return SchedulerStatsResponse.model_construct(
+        schedulers=[],  # Empty list since we're returning aggregates
+        scheduler_count=scheduler_count,
+        total_runnable_tasks=total_runnable,
+        avg_runnable_per_scheduler=avg_runnable,
+        cpu_pressure_detected=cpu_pressure,
+        interpretation=interpretation,
+        success=True,
+    )
+
+
 # Tools
-@mcp.tool()
 def get_server_version() -> ServerVersionResponse:
     """
     Get SQL Server version and instance information.
@@ -119,32 +381,20 @@ def get_server_version() -> ServerVersionResponse:
     logger.info("Tool called: get_server_version")
     try:
         conn = get_connection()
-        results = conn.execute_query(
-            """
-            SELECT
-                @@VERSION AS Version,
-                @@SERVERNAME AS ServerName
-            """
-        )
+        cached = _server_version_cache.get(conn)
+        if cached is not None:
+            logger.debug("Returning cached server version")
+            return cached
+
+        results = conn.execute_query(_SERVER_VERSION_SQL)
 
-        if results:
-            logger.info(f"Retrieved server version: {results[0]['ServerName']}")
-            return ServerVersionResponse(
-                version=results[0]["Version"],
-                server_name=results[0]["ServerName"],
-                success=True,
-            )
-        else:
-            logger.warning("No results returned from server version query")
-            return ServerVersionResponse(
-                version="",
-                server_name="",
-                success=False,
-                error="No results returned from query",
-            )
+        response = _build_version_response(results)
+        if response.success:
+            _server_version_cache[conn] = response
+        return response
 
     except Exception as e:
-        logger.error(f"Error getting server version: {str(e)}")
+        logger.error("Error getting server version: %s", e)
         return ServerVersionResponse(
             version="",
             server_name="",
@@ -153,7 +403,6 @@ def get_server_version() -> ServerVersionResponse:
         )
 
 
-@mcp.tool()
 def list_databases() -> DatabaseListResponse:
     """
     List all databases on the SQL Server instance.
@@ -165,31 +414,11 @@ def list_databases() -> DatabaseListResponse:
     logger.info("Tool called: list_databases")
     try:
         conn = get_connection()
-        results = conn.execute_query(
-            """
-            SELECT
-                name,
-                database_id,
-                CONVERT(VARCHAR, create_date, 120) AS create_date,
-                state_desc,
-                recovery_model_desc,
-                compatibility_level
-            FROM sys.databases
-            ORDER BY name
-            """
-        )
-
-        databases = [DatabaseInfo(**db) for db in results]
-        logger.info(f"Successfully retrieved {len(databases)} database(s)")
-
-        return DatabaseListResponse(
-            databases=databases,
-            count=len(databases),
-            success=True,
-        )
+        results = conn.execute_query(_LIST_DATABASES_SQL)
+        return _build_databases_response(results)
 
     except Exception as e:
-        logger.error(f"Error listing databases: {str(e)}")
+        logger.error("Error listing databases: %s", e)
         return DatabaseListResponse(
             databases=[],
             count=0,
@@ -198,8 +427,7 @@ def list_databases() -> DatabaseListResponse:
         )
 
 
-@mcp.tool()
-def get_active_sessions() -> ActiveSessionsResponse:
+def get_active_sessions(max_sql_len: int = _MAX_SQL_LEN_DEFAULT) -> ActiveSessionsResponse:
     """
     Get currently active sessions and queries on the SQL Server instance.
 
@@ -209,50 +437,20 @@ def get_active_sessions() -> ActiveSessionsResponse:
     and detecting blocking situations.
 
     Filters out system databases (master, msdb) and the monitoring query itself.
+    The sql_text is the currently executing statement, truncated server-side to
+    max_sql_len characters; raise it if full statement text is needed.
     """
     logger.info("Tool called: get_active_sessions")
     try:
         conn = get_connection()
+        # Point-in-time view; never serve it from the result cache
         results = conn.execute_query(
-            """
-            SELECT
-                sqltext.TEXT as sql_text,
-                req.session_id,
-                req.status,
-                req.command,
-                CONVERT(NUMERIC(8,1), req.cpu_time/1000.0) as cpu_seconds,
-                CONVERT(NUMERIC(8,1), req.total_elapsed_time/1000.0) as elapsed_seconds,
-                req.reads,
-                req.logical_reads,
-                req.wait_time,
-                req.last_wait_type,
-                req.blocking_session_id,
-                CONVERT(VARCHAR, con.connect_time, 120) as connect_time,
-                req.dop,
-                dm_es.host_name,
-                dm_es.program_name,
-                DB_NAME(req.database_id) as database_name,
-                dm_es.login_name
-            FROM sys.dm_exec_requests req
-            LEFT OUTER JOIN sys.dm_exec_sessions dm_es ON dm_es.session_id = req.session_id
-            LEFT OUTER JOIN sys.dm_exec_connections con ON con.connection_id = req.connection_id
-            CROSS APPLY sys.dm_exec_sql_text(req.sql_handle) AS sqltext
-            WHERE sqltext.TEXT NOT LIKE '%sqltext.TEXT%'
-            AND DB_NAME(req.database_id) NOT IN ('master', 'msdb')
-            """
-        )
-
-        sessions = [ActiveSessionInfo(**session) for session in results]
-        logger.info(f"Successfully retrieved {len(sessions)} active session(s)")
-
-        return ActiveSessionsResponse(
-            sessions=sessions,
-            count=len(sessions),
-            success=True,
+            _ACTIVE_SESSIONS_SQL, params=(int(max_sql_len),), cacheable=False
         )
+        return _build_sessions_response(results)
 
     except Exception as e:
-        logger.error(f"Error getting active sessions: {str(e)}")
+        logger.error("Error getting active sessions: %s", e)
         return ActiveSessionsResponse(
             sessions=[],
             count=0,
@@ -261,12 +459,11 @@ def get_active_sessions() -> ActiveSessionsResponse:
         )
 
 
-@mcp.tool()
 def get_scheduler_stats() -> SchedulerStatsResponse:
     """
     Get SQL Server scheduler statistics for CPU and Disk IO queue monitoring. Used for preassure detection.
 
-    Returns average scheduler information including runnable tasks (CPU queue depth) and pending I/O operations. 
+    Returns average scheduler information including runnable tasks (CPU queue depth) and pending I/O operations.
     This is critical for identifying CPU pressure and performance bottlenecks.
 
     Key metrics interpretation:
@@ -278,75 +475,60 @@ def get_scheduler_stats() -> SchedulerStatsResponse:
     logger.info("Tool called: get_scheduler_stats")
     try:
         conn = get_connection()
-        results = conn.execute_query(
-            """
-            SELECT
-                COUNT(*) AS scheduler_count,
-                AVG(1.0*runnable_tasks_count) AS avg_runnable_tasks,
-                AVG(1.0*pending_disk_io_count) AS avg_pending_disk_io_count
-            FROM sys.dm_os_schedulers
-            WHERE scheduler_id < 255
-            """
-        )
+        # Point-in-time view; never serve it from the result cache
+        results = conn.execute_query(_SCHEDULER_STATS_SQL, cacheable=False)
+        return _build_scheduler_response(results)
 
-        # Extract aggregated metrics from single result row
-        if not results:
-            raise Exception("No scheduler statistics returned")
-
-        result = results[0]
-        scheduler_count = result["scheduler_count"]
-        avg_runnable = float(result["avg_runnable_tasks"])
-        avg_pending_io = float(result["avg_pending_disk_io_count"])
-
-        # Calculate total runnable tasks (approximate from average)
-        total_runnable = int(avg_runnable * scheduler_count)
-        cpu_pressure = avg_runnable > 0
-
-        # Build interpretation based on updated metrics
-        interpretation_parts = []
-
-        # CPU pressure interpretation
-        if avg_runnable == 0:
-            interpretation_parts.append("No CPU pressure detected (avg runnable: 0)")
-        elif avg_runnable <= 0.5:
-            interpretation_parts.append(f"Minimal CPU pressure (avg runnable: {avg_runnable:.2f})")
-        elif avg_runnable <= 2:
-            interpretation_parts.append(f"MILD CPU PRESSURE (avg runnable: {avg_runnable:.2f})")
-        elif avg_runnable <= 5:
-            interpretation_parts.append(f"MODERATE CPU PRESSURE (avg runnable: {avg_runnable:.2f}) - Consider query optimization")
-        else:
-            interpretation_parts.append(f"CRITICAL CPU PRESSURE (avg runnable: {avg_runnable:.2f}) - Immediate action needed!")
-
-        # I/O pressure interpretation
-        if avg_pending_io <= 1:
-            interpretation_parts.append(f"Normal I/O activity (avg pending I/O: {avg_pending_io:.2f})")
-        elif avg_pending_io <= 5:
-            interpretation_parts.append(f"MODERATE I/O PRESSURE (avg pending I/O: {avg_pending_io:.2f})")
-        elif avg_pending_io <= 10:
-            interpretation_parts.append(f"HIGH I/O PRESSURE (avg pending I/O: {avg_pending_io:.2f}) - Check disk performance")
-        else:
-            interpretation_parts.append(f"CRITICAL I/O BOTTLENECK (avg pending I/O: {avg_pending_io:.2f}) - Check disk subsystem immediately!")
-
-        interpretation = " | ".join(interpretation_parts)
-
-        logger.info(
-            f"Retrieved scheduler stats: {scheduler_count} schedulers, "
-            f"avg runnable: {avg_runnable:.2f}, avg pending I/O: {avg_pending_io:.2f}"
+    except Exception as e:
+        logger.error("Error getting scheduler stats: %s", e)
+        return SchedulerStatsResponse(
+            schedulers=[],
+            scheduler_count=0,
+            total_runnable_tasks=0,
+            avg_runnable_per_scheduler=0.0,
+            cpu_pressure_detected=False,
+            interpretation="",
+            success=False,
+            error=str(e),
         )
 
-        return SchedulerStatsResponse(
-            schedulers=[],  # Empty list since we're returning aggregates
-            scheduler_count=scheduler_count,
-            total_runnable_tasks=total_runnable,
-            avg_runnable_per_scheduler=avg_runnable,
-            cpu_pressure_detected=cpu_pressure,
-            interpretation=interpretation,
-            success=True,
+
+async def get_health_snapshot() -> HealthSnapshotResponse:
+    """
+    Get a combined health snapshot of the SQL Server instance.
+
+    Runs the server version, database list, active sessions, and scheduler
+    statistics queries as one multi-statement batch — a single network
+    round-trip — and returns all four results in one response. This is
+    useful for dashboards that would otherwise issue four sequential tool
+    calls against a possibly remote server.
+    """
+    logger.info("Tool called: get_health_snapshot")
+    queries = [
+        _SERVER_VERSION_SQL,
+        _LIST_DATABASES_SQL,
+        _ACTIVE_SESSIONS_SQL,
+        _SCHEDULER_STATS_SQL,
+    ]
+    try:
+        conn = get_connection()
+        batches = await anyio.to_thread.run_sync(
+            functools.partial(conn.execute_many_queries, queries, (_MAX_SQL_LEN_DEFAULT,))
         )
+        version = _build_version_response(batches[0])
+        databases = _build_databases_response(batches[1])
+        sessions = _build_sessions_response(batches[2])
+        schedulers = _build_scheduler_response(batches[3])
 
     except Exception as e:
-        logger.error(f"Error getting scheduler stats: {str(e)}")
-        return SchedulerStatsResponse(
+        # The batch is all-or-nothing: if it fails, every section carries
+        # the same error so callers see a consistent failed snapshot
+        logger.error("Error getting health snapshot: %s", e)
+        error = str(e)
+        version = ServerVersionResponse(version="", server_name="", success=False, error=error)
+        databases = DatabaseListResponse(databases=[], count=0, success=False, error=error)
+        sessions = ActiveSessionsResponse(sessions=[], count=0, success=False, error=error)
+        schedulers = SchedulerStatsResponse(
             schedulers=[],
             scheduler_count=0,
             total_runnable_tasks=0,
@@ -354,5 +536,29 @@ def get_scheduler_stats() -> SchedulerStatsResponse:
             cpu_pressure_detected=False,
             interpretation="",
             success=False,
-            error=str(e),
+            error=error,
         )
+
+    return HealthSnapshotResponse.model_construct(
+        server_version=version,
+        databases=databases,
+        active_sessions=sessions,
+        scheduler_stats=schedulers,
+        success=version.success and databases.success and sessions.success and schedulers.success,
+    )
+
+
+# Synchronous tool implementations, registered in one table-driven pass.
+# Each goes through _run_in_thread so blocking database work runs in a
+# worker thread instead of on the server event loop.
+_SYNC_TOOLS = (
+    get_server_version,
+    list_databases,
+    get_active_sessions,
+    get_scheduler_stats,
+)
+
+for _tool in _SYNC_TOOLS:
+    mcp.tool()(_run_in_thread(_tool))
+
+mcp.tool()(get_health_snapshot)
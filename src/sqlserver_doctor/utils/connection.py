@@ -1,64 +1,350 @@
 """SQL Server connection management utilities."""
 
+import asyncio
+import atexit
+import copy
+import hashlib
+import logging
 import os
-from typing import Any
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from typing import Any, cast
 import pyodbc
 from dotenv import load_dotenv
 
 from .logger import setup_logger
 
-# Load environment variables
-load_dotenv()
+# Load environment variables; skip the .env file I/O entirely when the
+# MCP host already populated the environment
+if not os.getenv("SQL_SERVER_HOST"):
+    load_dotenv()
 
-# Setup logger
+# Setup logger. The bound-method aliases skip the attribute lookup on the
+# per-query paths, where logging is the dominant Python overhead once
+# results come from the cache.
 logger = setup_logger("sqlserver_doctor.connection")
+_log_debug = logger.debug
+_log_info = logger.info
+_log_error = logger.error
+
+# Driver-manager level connection pooling; makes reconnecting after a
+# dead-link invalidation cheap
+pyodbc.pooling = True
+
+# SQLSTATEs that indicate the link itself is dead and a reconnect is needed
+_RECONNECT_STATES = ("08S01", "08001")
+
+# Maximum number of query results kept in the TTL cache
+_CACHE_MAX_ENTRIES = 128
 
 
 class SQLServerConnection:
     """Manages SQL Server database connections."""
 
+    # Slots drop the per-instance __dict__ and make attribute reads a
+    # C array index; __weakref__ stays so instances can key weak caches
+    __slots__ = (
+        "host",
+        "port",
+        "database",
+        "user",
+        "password",
+        "driver",
+        "trust_cert",
+        "encrypt",
+        "_conn",
+        "_conn_lock",
+        "_conn_str",
+        "_cache",
+        "_cache_lock",
+        "_cache_ttl",
+        "_row_factories",
+        "_server_info",
+        "_aio_pool",
+        "_aio_pool_lock",
+        "__weakref__",
+    )
+
+    # Connection-string templates, one per auth mode; formatted once at init
+    _TMPL_COMMON = (
+        "DRIVER={{{driver}}};SERVER={host},{port};DATABASE={database};"
+        "TrustServerCertificate={trust_cert};Encrypt={encrypt}"
+    )
+    _TMPL_TRUSTED = _TMPL_COMMON + ";Trusted_Connection=yes"
+    _TMPL_SQL = _TMPL_COMMON + ";UID={user};PWD={password}"
+
     def __init__(self) -> None:
         """Initialize connection configuration from environment variables."""
-        self.host = os.getenv("SQL_SERVER_HOST", "localhost")
-        self.port = os.getenv("SQL_SERVER_PORT", "1433")
-        self.database = os.getenv("SQL_SERVER_DATABASE", "master")
-        self.user = os.getenv("SQL_SERVER_USER", "")
-        self.password = os.getenv("SQL_SERVER_PASSWORD", "")
-        self.driver = os.getenv("SQL_SERVER_DRIVER", "ODBC Driver 17 for SQL Server")
-        self.trust_cert = os.getenv("SQL_SERVER_TRUST_CERT", "yes")
-        self.encrypt = os.getenv("SQL_SERVER_ENCRYPT", "no")
-
-        auth_type = "SQL Server Authentication" if self.user else "Windows Authentication"
-        logger.info(
-            f"Initialized connection config: host={self.host}, port={self.port}, "
-            f"database={self.database}, auth_type={auth_type}"
-        )
+        self._conn: pyodbc.Connection | None = None
+        # Re-entrant: the execute paths hold it across the whole cursor
+        # lifetime (SQL Server rejects interleaved statements on one
+        # non-MARS connection) and _ensure_connection takes it again inside
+        self._conn_lock = threading.RLock()
 
-    def get_connection_string(self) -> str:
-        """Build the connection string based on configuration."""
-        conn_str_parts = [
-            f"DRIVER={{{self.driver}}}",
-            f"SERVER={self.host},{self.port}",
-            f"DATABASE={self.database}",
-            f"TrustServerCertificate={self.trust_cert}",
-            f"Encrypt={self.encrypt}",
-        ]
+        # Short-lived result cache for read-only diagnostic queries, keyed
+        # on normalized query text; LRU-evicted at _CACHE_MAX_ENTRIES.
+        # Guarded by its own lock since concurrent tool calls share it.
+        self._cache: OrderedDict[bytes, tuple[float, list[dict[str, Any]]]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_ttl = float(os.getenv("SQL_SERVER_CACHE_TTL", "30"))
+
+        # Compiled row factories keyed on the column tuple, one per schema
+        self._row_factories: dict[tuple[str, ...], Any] = {}
+
+        # @@VERSION/@@SERVERNAME never change for a session; fetched once
+        self._server_info: dict[str, Any] | None = None
+
+        # aioodbc pool for execute_query_async, created on first use; the
+        # lock keeps concurrent first callers from each building a pool
+        self._aio_pool: Any = None
+        self._aio_pool_lock = asyncio.Lock()
+
+        # Bind os.environ once; dict.get skips the os.getenv wrapper call
+        env = os.environ
+        self.host = env.get("SQL_SERVER_HOST", "localhost")
+        self.port = env.get("SQL_SERVER_PORT", "1433")
+        self.database = env.get("SQL_SERVER_DATABASE", "master")
+        self.user = env.get("SQL_SERVER_USER", "")
+        self.password = env.get("SQL_SERVER_PASSWORD", "")
+        self.driver = env.get("SQL_SERVER_DRIVER", "ODBC Driver 18 for SQL Server")
+        self.trust_cert = env.get("SQL_SERVER_TRUST_CERT", "yes")
+        self.encrypt = env.get("SQL_SERVER_ENCRYPT", "no")
+
+        # Configuration never changes after __init__, so the connection
+        # string is built exactly once
+        self._conn_str = self._build_connection_string()
 
+        if logger.isEnabledFor(logging.INFO):
+            auth_type = "SQL Server Authentication" if self.user else "Windows Authentication"
+            _log_info(
+                "Initialized connection config: host=%s, port=%s, database=%s, auth_type=%s",
+                self.host,
+                self.port,
+                self.database,
+                auth_type,
+            )
+
+    def _build_connection_string(self) -> str:
+        """Build the connection string based on configuration."""
         if self.user and self.password:
             # SQL Server Authentication
-            conn_str_parts.extend([f"UID={self.user}", f"PWD={self.password}"])
+            template = self._TMPL_SQL
         else:
             # Windows Authentication
-            conn_str_parts.append("Trusted_Connection=yes")
+            template = self._TMPL_TRUSTED
+
+        return template.format(
+            driver=self.driver,
+            host=self.host,
+            port=self.port,
+            database=self.database,
+            trust_cert=self.trust_cert,
+            encrypt=self.encrypt,
+            user=self.user,
+            password=self.password,
+        )
+
+    def _get_row_factory(self, columns: tuple[str, ...]) -> Any:
+        """Return a compiled row -> dict factory for the given column tuple.
+
+        The generated dict-literal lambda bakes the column names in as
+        constants, so building a row skips the per-row zip iterator and
+        repeated key hashing that dict(zip(columns, row)) pays. Factories
+        are memoized per schema since the column set of each diagnostic
+        query never changes.
+        """
+        factory = self._row_factories.get(columns)
+        if factory is None:
+            src = (
+                "lambda r: {"
+                + ", ".join(f"{name!r}: r[{index}]" for index, name in enumerate(columns))
+                + "}"
+            )
+            factory = eval(src, {})  # noqa: S307 - column names come from cursor.description
+            self._row_factories[columns] = factory
+        return factory
+
+    def get_connection_string(self) -> str:
+        """Return the connection string computed at initialization."""
+        return self._conn_str
+
+    def _ensure_connection(self) -> pyodbc.Connection:
+        """Return the persistent connection, establishing it if needed."""
+        with self._conn_lock:
+            if self._conn is None:
+                _log_info("Connecting to SQL Server: %s:%s/%s", self.host, self.port, self.database)
+                # autocommit skips the implicit begin/commit round-trip per
+                # statement, readonly lets the driver skip write-path setup,
+                # and the timeout bounds how long a dead host can stall us
+                self._conn = pyodbc.connect(
+                    self._conn_str, autocommit=True, readonly=True, timeout=5
+                )
+                _log_info("Connection established successfully")
+            return self._conn
+
+    def _invalidate_connection(self) -> None:
+        """Drop the persistent connection so the next call reconnects."""
+        with self._conn_lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except pyodbc.Error:
+                    pass
+                self._conn = None
+
+    def close(self) -> None:
+        """Close the persistent connection and async pool if open."""
+        pool = self._aio_pool
+        if pool is not None:
+            self._aio_pool = None
+            pool.close()
+            # wait_closed is a coroutine; without it the pool's acquired
+            # connections are never actually torn down
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                asyncio.run(pool.wait_closed())
+            else:
+                loop.create_task(pool.wait_closed())
+        self._invalidate_connection()
+
+    async def execute_query_async(
+        self, query: str, params: tuple[Any, ...] = ()
+    ) -> list[dict[str, Any]]:
+        """
+        Execute a SQL query without blocking the event loop.
+
+        Uses an aioodbc pool (sized via SQL_POOL_MAX, default 10) so N
+        concurrent tool calls overlap their SQL round-trips instead of
+        serializing on the single persistent connection. Requires the
+        optional aioodbc dependency; the sync execute_query is unaffected.
+
+        Args:
+            query: SQL query to execute, with ? placeholders for params
+            params: Values bound to the query's placeholders
+
+        Returns:
+            List of dictionaries where each dict represents a row
+        """
+        try:
+            import aioodbc
+        except ImportError as e:
+            raise RuntimeError(
+                "execute_query_async requires the optional aioodbc dependency "
+                "(pip install sqlserver-doctor-mcp[async])"
+            ) from e
+
+        if self._aio_pool is None:
+            # Double-checked under the lock: concurrent first callers must
+            # not each create a pool and leak the loser's connections
+            async with self._aio_pool_lock:
+                if self._aio_pool is None:
+                    self._aio_pool = await aioodbc.create_pool(
+                        dsn=self._conn_str,
+                        autocommit=True,
+                        minsize=1,
+                        maxsize=int(os.getenv("SQL_POOL_MAX", "10")),
+                    )
+
+        async with self._aio_pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                if params:
+                    await cursor.execute(query, *params)
+                else:
+                    await cursor.execute(query)
+                columns = tuple(column[0] for column in cursor.description)
+                rows = await cursor.fetchall()
+                return [self._get_row_factory(columns)(row) for row in rows]
+
+    def execute_query_iter(
+        self, query: str, params: tuple[Any, ...] = (), batch_size: int = 1000
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Execute a SQL query and yield result rows as dictionaries.
+
+        Rows are fetched from the server in batches of batch_size, so only
+        one batch of raw driver rows is alive at a time instead of the whole
+        result set. This keeps memory bounded for large result sets such as
+        active sessions on a busy server. The connection lock is held until
+        the iterator is exhausted or closed, so consume it promptly.
+
+        Args:
+            query: SQL query to execute, with ? placeholders for params
+            params: Values bound to the query's placeholders
+            batch_size: Number of rows to fetch from the driver per batch
+
+        Yields:
+            Dictionary per row
+
+        Raises:
+            pyodbc.Error: If there's a database connection or query error
+        """
+        # Build the truncated query preview only when DEBUG is actually on
+        if logger.isEnabledFor(logging.DEBUG):
+            _log_debug("Executing query: %s...", query.strip()[:100].replace("\n", " "))
+
+        try:
+            # Hold the lock for the whole cursor lifetime: concurrent tool
+            # calls share the persistent connection, and interleaving
+            # statements on it fails with "Connection is busy" (HY000)
+            with self._conn_lock:
+                conn = self._ensure_connection()
+                cursor = conn.cursor()
+                try:
+                    # Size the driver's fetch buffer to the batch so each
+                    # fetchmany round-trip fills in one go
+                    cursor.arraysize = batch_size
+                    if params:
+                        cursor.execute(query, *params)
+                    else:
+                        cursor.execute(query)
+
+                    # Get column names once per query and compile a row factory
+                    # specialized for this schema
+                    columns = tuple(column[0] for column in cursor.description)
+                    row_factory = self._get_row_factory(columns)
+                    row_count = 0
+                    while True:
+                        rows = cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        row_count += len(rows)
+                        yield from map(row_factory, rows)
 
-        return ";".join(conn_str_parts)
+                    _log_info("Query executed successfully, returned %d row(s)", row_count)
+                finally:
+                    cursor.close()
 
-    def execute_query(self, query: str) -> list[dict[str, Any]]:
+        except pyodbc.Error as e:
+            # logger.exception only stringifies the driver diagnostics if a
+            # handler actually accepts the record
+            logger.exception("Database error")
+            # Drop the connection on dead-link errors so the next call
+            # reconnects instead of failing forever
+            if e.args and e.args[0] in _RECONNECT_STATES:
+                self._invalidate_connection()
+            raise
+
+    def execute_query(
+        self, query: str, params: tuple[Any, ...] = (), cacheable: bool = True
+    ) -> list[dict[str, Any]]:
         """
         Execute a SQL query and return results as a list of dictionaries.
 
+        Passing filter values via params keeps the query text byte-stable
+        and keeps caller-supplied values out of the SQL string, so they can
+        never be interpreted as SQL. Results of cacheable queries are kept for
+        SQL_SERVER_CACHE_TTL seconds (default 30) keyed on the normalized
+        query text and params, so polling MCP clients skip the round-trip
+        entirely. Pass cacheable=False for statements whose results must
+        reflect the instant they are called.
+
         Args:
-            query: SQL query to execute
+            query: SQL query to execute, with ? placeholders for params
+            params: Values bound to the query's placeholders
+            cacheable: Whether the result may be served from the TTL cache
 
         Returns:
             List of dictionaries where each dict represents a row
@@ -66,64 +352,201 @@ class SQLServerConnection:
         Raises:
             pyodbc.Error: If there's a database connection or query error
         """
-        conn_str = self.get_connection_string()
+        if not cacheable or self._cache_ttl <= 0:
+            return list(self.execute_query_iter(query, params))
 
-        # Log query (truncate if too long)
-        query_preview = query.strip()[:100].replace("\n", " ")
-        logger.debug(f"Executing query: {query_preview}...")
+        key = hashlib.blake2b(
+            " ".join(query.split()).encode() + repr(params).encode(), digest_size=16
+        ).digest()
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                timestamp, rows = cached
+                if now - timestamp < self._cache_ttl:
+                    self._cache.move_to_end(key)
+                    _log_debug("Returning cached result for query")
+                    return [copy.copy(row) for row in rows]
+                # pop rather than del: another thread may have expired the
+                # entry between our get and here
+                self._cache.pop(key, None)
+
+        rows = list(self.execute_query_iter(query, params))
+        with self._cache_lock:
+            self._cache[key] = (now, rows)
+            if len(self._cache) > _CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+        # Hand out copied rows so callers cannot mutate the cached result
+        return [copy.copy(row) for row in rows]
+
+    def execute_query_raw(self, query: str) -> list[pyodbc.Row]:
+        """
+        Execute a SQL query and return the driver rows unconverted.
+
+        pyodbc.Row already supports both index and attribute access
+        (row[0], row.ServerName), so callers that only read a field or two
+        can skip the per-row dict allocation execute_query pays.
+
+        Args:
+            query: SQL query to execute
+
+        Returns:
+            List of pyodbc.Row objects
+
+        Raises:
+            pyodbc.Error: If there's a database connection or query error
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            _log_debug("Executing query: %s...", query.strip()[:100].replace("\n", " "))
 
         try:
-            logger.info(f"Connecting to SQL Server: {self.host}:{self.port}/{self.database}")
-            with pyodbc.connect(conn_str) as conn:
-                logger.info("Connection established successfully")
+            # Lock held across the cursor so concurrent tool calls cannot
+            # interleave statements on the shared connection
+            with self._conn_lock:
+                conn = self._ensure_connection()
                 cursor = conn.cursor()
-                cursor.execute(query)
+                try:
+                    # pyodbc ships no type stubs, so cast the untyped return
+                    rows = cast("list[pyodbc.Row]", cursor.execute(query).fetchall())
+                    _log_info("Query executed successfully, returned %d row(s)", len(rows))
+                    return rows
+                finally:
+                    cursor.close()
+
+        except pyodbc.Error as e:
+            # logger.exception only stringifies the driver diagnostics if a
+            # handler actually accepts the record
+            logger.exception("Database error")
+            # Drop the connection on dead-link errors so the next call
+            # reconnects instead of failing forever
+            if e.args and e.args[0] in _RECONNECT_STATES:
+                self._invalidate_connection()
+            raise
 
-                # Get column names
-                columns = [column[0] for column in cursor.description]
+    def execute_many_queries(
+        self, queries: list[str], params: tuple[Any, ...] = (), batch_size: int = 1000
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Execute several queries in one server round-trip.
 
-                # Fetch all rows and convert to list of dicts
-                results = []
-                for row in cursor.fetchall():
-                    results.append(dict(zip(columns, row)))
+        The queries are sent as a single batch and the result sets are
+        walked with cursor.nextset(), so N co-invoked diagnostic queries
+        cost one network round-trip instead of N. Results are never cached;
+        batches are used for point-in-time snapshots.
 
-                logger.info(f"Query executed successfully, returned {len(results)} row(s)")
-                return results
+        Args:
+            queries: SQL queries to execute, in order
+            params: Values bound to ? placeholders across the whole batch
+            batch_size: Number of rows to fetch from the driver per batch
+
+        Returns:
+            One list of row dictionaries per query, in query order
+
+        Raises:
+            pyodbc.Error: If there's a database connection or query error
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            _log_debug("Executing batch of %d queries", len(queries))
+
+        try:
+            # Lock held across the cursor so concurrent tool calls cannot
+            # interleave statements on the shared connection
+            with self._conn_lock:
+                conn = self._ensure_connection()
+                cursor = conn.cursor()
+                try:
+                    cursor.arraysize = batch_size
+                    batch_sql = ";\n".join(queries)
+                    if params:
+                        cursor.execute(batch_sql, *params)
+                    else:
+                        cursor.execute(batch_sql)
+
+                    batches: list[list[dict[str, Any]]] = []
+                    for _ in queries:
+                        columns = tuple(column[0] for column in cursor.description)
+                        row_factory = self._get_row_factory(columns)
+                        batches.append([row_factory(row) for row in cursor.fetchall()])
+                        cursor.nextset()
+
+                    _log_info("Batch executed successfully, %d result set(s)", len(batches))
+                    return batches
+                finally:
+                    cursor.close()
 
         except pyodbc.Error as e:
-            logger.error(f"Database error: {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error: {str(e)}")
+            # logger.exception only stringifies the driver diagnostics if a
+            # handler actually accepts the record
+            logger.exception("Database error")
+            # Drop the connection on dead-link errors so the next call
+            # reconnects instead of failing forever
+            if e.args and e.args[0] in _RECONNECT_STATES:
+                self._invalidate_connection()
             raise
 
+    def get_server_info(self) -> dict[str, Any]:
+        """
+        Return the server version and name, cached for the instance lifetime.
+
+        Returns:
+            Dictionary with Version and ServerName keys
+        """
+        if self._server_info is None:
+            result = self.execute_query("SELECT @@VERSION AS Version, @@SERVERNAME AS ServerName")
+            self._server_info = result[0]
+        return self._server_info
+
     def test_connection(self) -> dict[str, Any]:
         """
         Test the database connection.
 
+        The liveness probe itself is a bare SELECT 1 so the round-trip
+        payload stays minimal; the version/name metadata comes from the
+        cached get_server_info.
+
         Returns:
             Dictionary with connection status and server info
         """
-        logger.info("Testing database connection...")
+        _log_info("Testing database connection...")
         try:
-            result = self.execute_query("SELECT @@VERSION AS Version, @@SERVERNAME AS ServerName")
-            logger.info("Connection test successful")
-            return {"success": True, "message": "Connection successful", "server_info": result[0]}
+            self.execute_query("SELECT 1 AS ok", cacheable=False)
+            _log_info("Connection test successful")
+            return {
+                "success": True,
+                "message": "Connection successful",
+                "server_info": self.get_server_info(),
+            }
         except Exception as e:
-            logger.error(f"Connection test failed: {str(e)}")
+            _log_error("Connection test failed: %s", e)
             return {"success": False, "message": f"Connection failed: {str(e)}"}
 
 
 # Global connection instance
 _connection: SQLServerConnection | None = None
+_connection_lock = threading.Lock()
 
 
 def get_connection() -> SQLServerConnection:
-    """Get or create the global SQL Server connection instance."""
+    """Get or create the global SQL Server connection instance.
+
+    Uses double-checked locking: the common case is a single unsynchronized
+    read, and the lock is only taken on first use so concurrent tool calls
+    cannot race into building two instances.
+    """
     global _connection
-    if _connection is None:
-        logger.info("Creating new SQL Server connection instance")
-        _connection = SQLServerConnection()
-    else:
-        logger.debug("Reusing existing SQL Server connection instance")
-    return _connection
+    conn = _connection
+    if conn is not None:
+        _log_debug("Reusing existing SQL Server connection instance")
+        return conn
+    with _connection_lock:
+        if _connection is None:
+            _log_info("Creating new SQL Server connection instance")
+            _connection = SQLServerConnection()
+        return _connection
+
+
+@atexit.register
+def _close_connection_at_exit() -> None:
+    """Close the global connection on interpreter shutdown."""
+    if _connection is not None:
+        _connection.close()
@@ -33,4 +33,8 @@ def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
 
         logger.addHandler(handler)
 
+    # Records have their own handler; propagating them to the root logger
+    # would duplicate output and pay a second handler walk per record
+    logger.propagate = False
+
     return logger
@@ -0,0 +1,96 @@
+"""Shared pytest fixtures."""
+
+import copy
+import os
+from unittest.mock import patch
+
+import pytest
+
+import sqlserver_doctor.server as server
+from sqlserver_doctor.utils.connection import SQLServerConnection
+
+
+class _ConnectionStub:
+    """Minimal connection double.
+
+    A plain class rather than SimpleNamespace so instances stay hashable
+    and weakref-able, which the server's per-connection version cache
+    requires.
+    """
+
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+
+
+@pytest.fixture
+def default_conn():
+    """Yield a SQLServerConnection built against an empty environment.
+
+    The env patch stays active for the duration of the test so queries run
+    under the same default configuration the connection was built with.
+    """
+    with patch.dict(os.environ, {}, clear=True):
+        yield SQLServerConnection()
+
+
+# Shared slot read by the swapped-in get_connection. server.get_connection
+# is redirected once per test by the autouse fixture below; installing a
+# stub is then a single dict write with no patcher or import-path
+# resolution involved.
+_connection_slot = {"conn": None}
+
+
+@pytest.fixture(autouse=True)
+def _swap_get_connection():
+    """Route server.get_connection through the shared connection slot."""
+    real = server.get_connection
+    server.get_connection = lambda: _connection_slot["conn"] or real()
+    yield
+    server.get_connection = real
+    _connection_slot["conn"] = None
+
+
+@pytest.fixture(scope="session")
+def _conn_template():
+    """Prototype connection stub, built once and shallow-copied per test."""
+    return _ConnectionStub(execute_query=None, execute_many_queries=None, calls=None)
+
+
+@pytest.fixture
+def patch_get_connection(_conn_template):
+    """Install a lightweight stub connection for the server tools.
+
+    Returns an installer: call it with return_value or side_effect to
+    control what the stub's execute_query does (many_* for
+    execute_many_queries). The installed stub is returned and records
+    calls in stub.calls.
+    """
+
+    def install(
+        return_value=None,
+        side_effect=None,
+        many_return_value=None,
+        many_side_effect=None,
+    ):
+        calls = []
+
+        def execute_query(*args, **kwargs):
+            calls.append((args, kwargs))
+            if side_effect is not None:
+                raise side_effect
+            return return_value
+
+        def execute_many_queries(*args, **kwargs):
+            calls.append((args, kwargs))
+            if many_side_effect is not None:
+                raise many_side_effect
+            return many_return_value
+
+        stub = copy.copy(_conn_template)
+        stub.execute_query = execute_query
+        stub.execute_many_queries = execute_many_queries
+        stub.calls = calls
+        _connection_slot["conn"] = stub
+        return stub
+
+    return install
@@ -1,22 +1,21 @@
 """Tests for SQL Server connection utilities."""
 
+import asyncio
 import os
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 from sqlserver_doctor.utils.connection import SQLServerConnection, get_connection
 
 
 class TestSQLServerConnection:
     """Tests for SQLServerConnection class."""
 
-    def test_init_default_values(self):
+    def test_init_default_values(self, default_conn):
         """Test connection initialization with default values."""
-        with patch.dict(os.environ, {}, clear=True):
-            conn = SQLServerConnection()
-            assert conn.host == "localhost"
-            assert conn.port == "1433"
-            assert conn.database == "master"
-            assert conn.driver == "ODBC Driver 18 for SQL Server"
+        assert default_conn.host == "localhost"
+        assert default_conn.port == "1433"
+        assert default_conn.database == "master"
+        assert default_conn.driver == "ODBC Driver 18 for SQL Server"
 
     def test_init_from_env_variables(self):
         """Test connection initialization from environment variables."""
@@ -35,14 +34,12 @@ class TestSQLServerConnection:
             assert conn.user == "testuser"
             assert conn.password == "testpass"
 
-    def test_connection_string_windows_auth(self):
+    def test_connection_string_windows_auth(self, default_conn):
         """Test connection string with Windows Authentication."""
-        with patch.dict(os.environ, {}, clear=True):
-            conn = SQLServerConnection()
-            conn_str = conn.get_connection_string()
-            assert "Trusted_Connection=yes" in conn_str
-            assert "UID=" not in conn_str
-            assert "PWD=" not in conn_str
+        conn_str = default_conn.get_connection_string()
+        assert "Trusted_Connection=yes" in conn_str
+        assert "UID=" not in conn_str
+        assert "PWD=" not in conn_str
 
     def test_connection_string_sql_auth(self):
         """Test connection string with SQL Server Authentication."""
@@ -58,21 +55,20 @@ class TestSQLServerConnection:
             assert "Trusted_Connection=yes" not in conn_str
 
     @patch("sqlserver_doctor.utils.connection.pyodbc.connect")
-    def test_execute_query_success(self, mock_connect):
+    def test_execute_query_success(self, mock_connect, default_conn):
         """Test successful query execution."""
         # Setup mock
         mock_cursor = MagicMock()
         mock_cursor.description = [("col1",), ("col2",)]
-        mock_cursor.fetchall.return_value = [("val1", "val2")]
+        mock_cursor.fetchmany.side_effect = [[("val1", "val2")], []]
         mock_conn = MagicMock()
         mock_conn.cursor.return_value = mock_cursor
         mock_conn.__enter__.return_value = mock_conn
         mock_connect.return_value = mock_conn
 
         # Execute
-        with patch.dict(os.environ, {}, clear=True):
-            conn = SQLServerConnection()
-            results = conn.execute_query("SELECT col1, col2 FROM test")
+        conn = default_conn
+        results = conn.execute_query("SELECT col1, col2 FROM test")
 
         # Verify
         assert len(results) == 1
@@ -80,31 +76,180 @@ class TestSQLServerConnection:
         mock_cursor.execute.assert_called_once_with("SELECT col1, col2 FROM test")
 
     @patch("sqlserver_doctor.utils.connection.pyodbc.connect")
-    def test_execute_query_error(self, mock_connect):
+    def test_execute_query_raw_returns_driver_rows(self, mock_connect, default_conn):
+        """Test that the raw variant returns rows without dict conversion."""
+        # Setup mock
+        driver_rows = [("val1", "val2")]
+        mock_cursor = MagicMock()
+        mock_cursor.execute.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = driver_rows
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value = mock_conn
+
+        # Execute
+        conn = default_conn
+        results = conn.execute_query_raw("SELECT col1, col2 FROM test")
+
+        # Verify - rows come back exactly as the driver produced them
+        assert results is driver_rows
+        mock_cursor.execute.assert_called_once_with("SELECT col1, col2 FROM test")
+
+    @patch("sqlserver_doctor.utils.connection.pyodbc.connect")
+    def test_execute_query_iter_batches(self, mock_connect, default_conn):
+        """Test that the iterator streams rows across fetchmany batches."""
+        # Setup mock - two batches of rows before exhaustion
+        mock_cursor = MagicMock()
+        mock_cursor.description = [("col1",)]
+        mock_cursor.fetchmany.side_effect = [[("a",), ("b",)], [("c",)], []]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_conn.__enter__.return_value = mock_conn
+        mock_connect.return_value = mock_conn
+
+        # Execute
+        conn = default_conn
+        results = list(conn.execute_query_iter("SELECT col1 FROM test", batch_size=2))
+
+        # Verify
+        assert results == [{"col1": "a"}, {"col1": "b"}, {"col1": "c"}]
+
+    @patch("sqlserver_doctor.utils.connection.pyodbc.connect")
+    def test_execute_many_queries_result_sets(self, mock_connect, default_conn):
+        """Test that a batch returns one row list per query, in order."""
+        # Setup mock - one fetchall per result set, advanced via nextset
+        mock_cursor = MagicMock()
+        mock_cursor.description = [("col1",)]
+        mock_cursor.fetchall.side_effect = [[("a",)], [("b",), ("c",)]]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value = mock_conn
+
+        # Execute
+        conn = default_conn
+        results = conn.execute_many_queries(["SELECT 1", "SELECT 2"])
+
+        # Verify - the queries go out as one batch and come back split
+        assert results == [[{"col1": "a"}], [{"col1": "b"}, {"col1": "c"}]]
+        mock_cursor.execute.assert_called_once_with("SELECT 1;\nSELECT 2")
+        assert mock_cursor.nextset.call_count == 2
+
+    @patch("aioodbc.create_pool", new_callable=AsyncMock)
+    def test_execute_query_async_rows(self, mock_create_pool, default_conn):
+        """Test that the async path pools connections and converts rows."""
+        # Setup mock - async pool/connection/cursor context managers
+        mock_cursor = MagicMock()
+        mock_cursor.description = [("col1",)]
+        mock_cursor.execute = AsyncMock()
+        mock_cursor.fetchall = AsyncMock(return_value=[("val1",)])
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value.__aenter__.return_value = mock_cursor
+        mock_pool = MagicMock()
+        mock_pool.acquire.return_value.__aenter__.return_value = mock_conn
+        mock_create_pool.return_value = mock_pool
+
+        # Execute twice - the pool must only be created once
+        conn = default_conn
+
+        async def run_twice():
+            first = await conn.execute_query_async("SELECT col1 FROM test")
+            second = await conn.execute_query_async("SELECT col1 FROM test")
+            return first, second
+
+        results1, results2 = asyncio.run(run_twice())
+
+        # Verify
+        assert results1 == results2 == [{"col1": "val1"}]
+        mock_create_pool.assert_awaited_once()
+        mock_cursor.execute.assert_awaited_with("SELECT col1 FROM test")
+
+    @patch("sqlserver_doctor.utils.connection.pyodbc.connect")
+    def test_execute_query_reuses_connection(self, mock_connect, default_conn):
+        """Test that repeated queries reuse the persistent connection."""
+        mock_cursor = MagicMock()
+        mock_cursor.description = [("col1",)]
+        mock_cursor.fetchmany.side_effect = [[("val1",)], [], [("val2",)], []]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value = mock_conn
+
+        conn = default_conn
+        conn.execute_query("SELECT col1 FROM test1")
+        conn.execute_query("SELECT col1 FROM test2")
+
+        mock_connect.assert_called_once()
+
+    @patch("sqlserver_doctor.utils.connection.pyodbc.connect")
+    def test_execute_query_cached_within_ttl(self, mock_connect, default_conn):
+        """Test that identical queries are served from the result cache."""
+        mock_cursor = MagicMock()
+        mock_cursor.description = [("col1",)]
+        mock_cursor.fetchmany.side_effect = [[("val1",)], []]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value = mock_conn
+
+        conn = default_conn
+        results1 = conn.execute_query("SELECT col1 FROM test")
+        results2 = conn.execute_query("SELECT col1 FROM test")
+
+        assert results1 == results2 == [{"col1": "val1"}]
+        mock_cursor.execute.assert_called_once()
+
+        # Returned rows are copies: mutating one result must not leak into
+        # the cached entry or other callers
+        results1[0]["col1"] = "mutated"
+        results3 = conn.execute_query("SELECT col1 FROM test")
+        assert results2 == results3 == [{"col1": "val1"}]
+
+    @patch("sqlserver_doctor.utils.connection.pyodbc.connect")
+    def test_execute_query_not_cacheable(self, mock_connect, default_conn):
+        """Test that cacheable=False always re-executes the query."""
+        mock_cursor = MagicMock()
+        mock_cursor.description = [("col1",)]
+        mock_cursor.fetchmany.side_effect = [[("val1",)], [], [("val2",)], []]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_connect.return_value = mock_conn
+
+        conn = default_conn
+        results1 = conn.execute_query("SELECT col1 FROM test", cacheable=False)
+        results2 = conn.execute_query("SELECT col1 FROM test", cacheable=False)
+
+        assert results1 == [{"col1": "val1"}]
+        assert results2 == [{"col1": "val2"}]
+        assert mock_cursor.execute.call_count == 2
+
+    @patch("sqlserver_doctor.utils.connection.pyodbc.connect")
+    def test_execute_query_error(self, mock_connect, default_conn):
         """Test query execution with database error."""
         mock_connect.side_effect = Exception("Connection failed")
 
-        with patch.dict(os.environ, {}, clear=True):
-            conn = SQLServerConnection()
-            with pytest.raises(Exception, match="Connection failed"):
-                conn.execute_query("SELECT 1")
+        conn = default_conn
+        with pytest.raises(Exception, match="Connection failed"):
+            conn.execute_query("SELECT 1")
 
     @patch("sqlserver_doctor.utils.connection.pyodbc.connect")
-    def test_test_connection_success(self, mock_connect):
+    def test_test_connection_success(self, mock_connect, default_conn):
         """Test successful connection test."""
-        # Setup mock
+        # Setup mock - first result set answers the SELECT 1 probe, the
+        # second provides the server metadata
         mock_cursor = MagicMock()
         mock_cursor.description = [("Version",), ("ServerName",)]
-        mock_cursor.fetchall.return_value = [("SQL Server 2019", "TESTSERVER")]
+        mock_cursor.fetchmany.side_effect = [
+            [("SQL Server 2019", "TESTSERVER")],
+            [],
+            [("SQL Server 2019", "TESTSERVER")],
+            [],
+        ]
         mock_conn = MagicMock()
         mock_conn.cursor.return_value = mock_cursor
         mock_conn.__enter__.return_value = mock_conn
         mock_connect.return_value = mock_conn
 
         # Execute
-        with patch.dict(os.environ, {}, clear=True):
-            conn = SQLServerConnection()
-            result = conn.test_connection()
+        conn = default_conn
+        result = conn.test_connection()
 
         # Verify
         assert result["success"] is True
@@ -112,13 +257,12 @@ class TestSQLServerConnection:
         assert result["server_info"]["ServerName"] == "TESTSERVER"
 
     @patch("sqlserver_doctor.utils.connection.pyodbc.connect")
-    def test_test_connection_failure(self, mock_connect):
+    def test_test_connection_failure(self, mock_connect, default_conn):
         """Test failed connection test."""
         mock_connect.side_effect = Exception("Network error")
 
-        with patch.dict(os.environ, {}, clear=True):
-            conn = SQLServerConnection()
-            result = conn.test_connection()
+        conn = default_conn
+        result = conn.test_connection()
 
         assert result["success"] is False
         assert "Connection failed" in result["message"]